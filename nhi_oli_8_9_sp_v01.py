@@ -25,10 +25,12 @@ and the outputs are:
 2) Individual images of the Landsat 8 & 9 raster data in GeoTiff format, in which NHI hot
    pixels were found
    
-3) Vector shapefile (ESRI format) data of those Landsat 8 & 9 raster images mentioned in item 2)
+3) Vector data in GeoPackage format (.gpkg) of those Landsat 8 & 9 raster images mentioned in item 2)
 
 4) Plots in interactive HTML format of some variables listed in item 1)
 
+5) A Parquet file with the same results of item 1), only if pyarrow is installed
+
 Thus, the user must have a Gmail or an institutional workspace account. To avoid charges,
 you must select the Non-commercial or Research/Academic track during registration. Details
 on how to properly register your account can be found here:
@@ -152,12 +154,16 @@ print("\nInput data successfully read!")
 #<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>#
 #==================================================================#
 import ee # conda install -c conda-forge earthengine-api
-ee.Authenticate()
 print("Trying to authenticate the gmail account in GEE platform...\n")
 #ee.Initialize()
 ee_proj = 'ee-' + gmail_name
-ee.Initialize(project=ee_proj)
-import geemap # conda install -c conda-forge geemap
+# Reutilizar las credenciales guardadas; sólo si no existen (o expiraron)
+# se abre el proceso de autenticación interactivo en el navegador
+try:
+    ee.Initialize(project=ee_proj)
+except Exception:
+    ee.Authenticate()
+    ee.Initialize(project=ee_proj)
 import folium
 import os
 import datetime
@@ -168,39 +174,14 @@ from matplotlib.ticker import FuncFormatter
 import matplotlib.ticker as ticker
 from pathlib import Path
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import importlib.util
 
 
 print(f"Account '{ee_proj}' successfully authenticated to the GEE platform\n")
 print("Working on site:", volcan)
 
-#===================================================================#
-def filter_empty_images(collection, region, scale=30):
-    def check_for_data(image):
-        # Binarizar las imágenes de la colección
-        # 1 for non-zero pixels, 0 for zero pixels
-        mask = image.neq(0)
-        any_band_has_data_mask = mask.reduce(ee.Reducer.max())
-        stats = any_band_has_data_mask.reduceRegion(
-            reducer=ee.Reducer.max(),
-            geometry=region,
-            scale=scale,
-            maxPixels=1e9
-        )
-
-        # Get the max value (which will be 1 if data exists, 0 if not)
-        has_data = ee.Number(stats.get('max'))
-        return image.set('has_data', has_data)
-
-    collection_with_stats = collection.map(check_for_data)
-
-    # Remover las imágenes con valor = 0
-    filtered_collection = collection_with_stats.filter(
-        ee.Filter.eq('has_data', 1)
-    )
-
-    return filtered_collection
-
-#===============================================================================#
 
 #==================================================================#
 #          ACCEDER a las COLECCIONES Landsat 8 y 9 de GEE          #
@@ -211,24 +192,19 @@ roi = ee.Geometry.Point([lon, lat]).buffer(radio*1e3)
 #
 # USGS Landsat 8 Collection 2 Tier 1 Raw Scenes
 # Dataset Availability from 2013-03-18T15:58:14Z
-L8raw = ee.ImageCollection('LANDSAT/LC08/C02/T1').filterDate(start,end).\
+L8raw = ee.ImageCollection('LANDSAT/LC08/C02/T1').\
         filterDate(ee.Date(start),ee.Date(end).advance(1, 'day')).\
         filterMetadata('SUN_ELEVATION','greater_than', 0).\
         select(['B1','B5','B6','B7']).filter(ee.Filter.bounds(punto))
 #
 # USGS Landsat 9 Collection 2 Tier 1 Raw Scenes
 # Dataset Availability from 2021-10-31T00:00:00Z
-L9raw = ee.ImageCollection('LANDSAT/LC09/C02/T1').filterDate(start,end).\
+L9raw = ee.ImageCollection('LANDSAT/LC09/C02/T1').\
         filterDate(ee.Date(start),ee.Date(end).advance(1, 'day')).\
         filterMetadata('SUN_ELEVATION','greater_than', 0).\
         select(['B1','B5','B6','B7']).filter(ee.Filter.bounds(punto))
 #
 print(f"Date interval provided by the user: {start} - {end}\n")
-print(f"Number of Landsat-8 images that covers the site \
-{volcan} = {L8raw.size().getInfo()}")
-#
-print(f"Number of Landsat-9 images that covers the site \
-{volcan} = {L9raw.size().getInfo()}\n")
 
 #==================================================================#
 #          UNIR, CALIBRAR y RECORTAR las imágenes Landsat          #
@@ -256,65 +232,60 @@ def add_time_start(image):
 # Unir, Calibrar (clip) y Recortar todas las imágenes Landsat
 Lcal = (L8raw.merge(L9raw)).map(cal_landsat).map(clip_img)
 
-print(f"Total number of merged Landsat 8 & 9 callibrated and crop \
-= {Lcal.size().getInfo()}")
-
-# Extraer fechas de la colección Landsat unida
-#date_property = Lcal.aggregate_array("system:time_start")
-date_property = Lcal.aggregate_array("system:time_start").getInfo()
-fechas_dt = pd.to_datetime(date_property, unit="ms", utc=True)
-
 #==================================================================#
 #         CALCULAR los NHI (SWIR y SWNIR) y EXTREME PIXELS         #
 #==================================================================#
 
-#=========================================#
-# Landsat NHI SWIR > 0 | mid-low intensity
-#=====================================================#
-# Función para calcular los hot pixels (hp) del NHI_SWIR para 1 imagen Landsat
-def L_nhi_swir_hp(img):
-  nhi = img.normalizedDifference(['B7', 'B6']).rename('nhi_swir')
-  return img.addBands(nhi.updateMask(nhi.gt(0)))
-#=========================================#
-
-#=======================================#
-# Landsat NHI SWNIR > 0 / high intensity
-#======================================================#
-# Función para calcular los hot pixels (hp) del NHI_SWNIR para 1 imagen Landsat
-def L_nhi_swnir_hp(img):
-  nhi = img.normalizedDifference(['B6', 'B5']).rename('nhi_swnir')
-  return img.addBands(nhi.updateMask(nhi.gt(0)))
-#======================================#
+# Umbrales de radiancia de los píxeles calientes extremos (B6 >= y B1 <)
+umbral_ext_b6 = 71.3
+umbral_ext_b1 = 70
 
-#===========================#
-# Píxeles calientes extremos
-#========================================================#
-# Función para Calcular PIXELES EXRTREMOS del NHI Landsat
-def L_ext_pixel(img):
-  ext_pix = (img.normalizedDifference(['B7', 'B6']))\
-    .And(img.select('B6').gte(71.3)).And(img.select('B1').lt(70)).rename('L_ext_pix')
-  return img.addBands(ext_pix.updateMask(ext_pix.gt(0)))
-#========================================================#
+#=============================================================================#
+# Función para calcular en 1 sola pasada sobre 1 imagen Landsat:
+#  - NHI SWIR > 0 | mid-low intensity  -> 'nhi_swir'
+#  - NHI SWNIR > 0 / high intensity    -> 'nhi_swnir'
+#  - Píxeles calientes extremos        -> 'L_ext_pix'
+#  - B6 y B7 del OLI enmascaradas con el NHI_SWIR y el NHI_SWNIR como máscaras
+# Cada NHI se calcula una sola vez y se reutiliza en todas las bandas derivadas
+def L_nhi_all(img):
+  nhi_swir = img.normalizedDifference(['B7', 'B6'])
+  nhi_swnir = img.normalizedDifference(['B6', 'B5'])
+  b6 = img.select('B6')
+  b7 = img.select('B7')
+  ext_pix = nhi_swir.And(b6.gte(umbral_ext_b6)).And(img.select('B1').lt(umbral_ext_b1))
+  return img.addBands([
+      nhi_swir.updateMask(nhi_swir.gt(0)).rename('nhi_swir'),
+      nhi_swnir.updateMask(nhi_swnir.gt(0)).rename('nhi_swnir'),
+      ext_pix.updateMask(ext_pix.gt(0)).rename('L_ext_pix'),
+      b6.updateMask(nhi_swir.gte(0)).rename('B6_nhi_masked_swir'),
+      b6.updateMask(nhi_swnir.gte(0)).rename('B6_nhi_masked_swnir'),
+      b7.updateMask(nhi_swir.gte(0)).rename('B7_nhi_masked_swir'),
+      b7.updateMask(nhi_swnir.gte(0)).rename('B7_nhi_masked_swnir')
+  ])
+#=============================================================================#
 
 #===================================================#
-# Contar pixels en una imagenCollection y banda dada
+# Contar pixels en una imagenCollection y bandas dadas
 #===================================================================#
 # Function para contar el número de pixels de cada imagen en ImageCollection
-def count_pixels_per_image(collection, bandname, scale):
+# y su área real en m2 (ee.Image.pixelArea, en lugar de suponer 30 x 30 m).
+# Todas las bandas se reducen con 1 sola reducción por imagen, y el conteo y
+# el área se guardan en las propiedades '<banda>_count' y '<banda>_area'
+def count_pixels_per_image(collection, bandnames, scale):
     def f(img):
-        band = img.select(bandname)
-        # contar pixeles
-        pixel_count = band.reduceRegion(
-            reducer=ee.Reducer.count(),
+        # Cada banda se reemplaza por el área de sus píxeles (conserva la máscara)
+        areas = img.select(bandnames).multiply(0).add(ee.Image.pixelArea())
+        # contar pixeles y sumar sus áreas
+        pixel_stats = areas.reduceRegion(
+            reducer=ee.Reducer.count().combine(ee.Reducer.sum(), sharedInputs=True),
             geometry=img.geometry(),
             scale=scale,
             maxPixels=1e13
-        ).get(bandname)
-        return img.set('pixel_count', pixel_count)
+        ).rename([b + '_sum' for b in bandnames], [b + '_area' for b in bandnames])
+        return img.set(pixel_stats)
         #
-    #nombre = bandname + "_count"
-    pixel_counts = collection.map(f).aggregate_array('pixel_count').getInfo()
-    return pixel_counts
+    # Se devuelve la colección, el getInfo() se hace una sola vez al final
+    return collection.map(f)
 #===================================================================#
 
 
@@ -322,62 +293,27 @@ def count_pixels_per_image(collection, bandname, scale):
 #         Calcular las radiancias Landsat B6 (1.6$μ$m) y B7 (2.2$μ$)         #
 #============================================================================#
 
-#=========================================================================#
-# Función para enmascarar la B6 del OLI utilizando al NHI_SWIR como máscara
-def mask_L_B6_swir(img):
-  nhi = img.normalizedDifference(['B7', 'B6'])
-  return img.select('B6').updateMask(nhi.gte(0)).rename('B6_nhi_masked_swir')
-#=========================================================================#
-
-#==========================================================================#
-# Función para enmascarar la B6 del OLI utilizando al NHI_SWNIR como máscara
-def mask_L_B6_swnir(img):
-  nhi = img.normalizedDifference(['B6', 'B5'])
-  return img.select('B6').updateMask(nhi.gte(0)).rename('B6_nhi_masked_swnir')
-#==========================================================================#
-
-#=========================================================================#
-# Función para enmascarar la B7 del OLI utilizando al NHI_SWIR como máscara
-def mask_L_B7_swir(img):
-  nhi = img.normalizedDifference(['B7', 'B6'])
-  return img.select('B7').updateMask(nhi.gte(0)).rename('B7_nhi_masked_swir')
-#=========================================================================#
-
-#==========================================================================#
-# Función para enmascarar la B7 del OLI utilizando al NHI_SWNIR como máscara
-def mask_L_B7_swnir(img):
-  nhi = img.normalizedDifference(['B6', 'B5'])
-  return img.select('B7').updateMask(nhi.gte(0)).rename('B7_nhi_masked_swnir')
-#==========================================================================#
-
 #========================================================#
 # Función para sumar el valor de todos los píxeles de
-# una banda específica en una ImgColección
-def sum_band_each_image(collection, bandname, scale):
+# varias bandas en una ImgColección, con 1 sola reducción por imagen.
+# Devuelve una colección de ee.Feature con la suma de cada banda como propiedad
+def sum_band_each_image(collection, bandnames, scale):
   def sum_band_per_image(img):
-    band = img.select(bandname)
-    sum_val = band.reduceRegion( reducer=ee.Reducer.sum(),
+    sum_vals = img.select(bandnames).reduceRegion( reducer=ee.Reducer.sum(),
                                 geometry=img.geometry(),
                                 scale=scale,
-                                maxPixels=1e13 ).get(bandname)
-    return ee.Feature(None, {bandname: sum_val})
+                                maxPixels=1e13 )
+    return ee.Feature(None, sum_vals)
   sum_per_image = collection.map(sum_band_per_image)
-  sum_values = sum_per_image.aggregate_array(bandname)
-  return sum_values
+  return sum_per_image
 #========================================================#
 
-#=====================================================#
-# Función para convertit una ee.lista and numpy float
-def eelist2float(eelist):
-  return np.array(eelist.getInfo(), dtype='float32')
-#=====================================================#
-
 print("\nComputing the NHI index over the entire image collection...")
 #========================================#
 #     NHI píxles calientes y extremos    #
 # Aquí estoy creando una multicoleccion #
 #========================================#
-L_nhi_ext_pix = Lcal.map(L_nhi_swir_hp).map(L_nhi_swnir_hp).map(L_ext_pixel)
+L_nhi_ext_pix = Lcal.map(L_nhi_all)
 #print('\nSize of original L_nhi_ext_pix collection:', L_nhi_ext_pix.size().getInfo())
 
 
@@ -385,31 +321,25 @@ L_nhi_ext_pix = Lcal.map(L_nhi_swir_hp).map(L_nhi_swnir_hp).map(L_ext_pixel)
 #   Contando los NHI pixeles calientes y extremos  #
 # Aquí estoy divdiendo la collection L_nhi_ext_pix #
 #==================================================#
-L_nhi_swir_pc = count_pixels_per_image(L_nhi_ext_pix, 'nhi_swir', 30)
-L_nhi_swnir_pc = count_pixels_per_image(L_nhi_ext_pix, 'nhi_swnir', 30)
-L_nhi_ep_pc = count_pixels_per_image(L_nhi_ext_pix, 'L_ext_pix', 30)
+L_nhi_conteos = count_pixels_per_image(L_nhi_ext_pix, ['nhi_swir', 'nhi_swnir', 'L_ext_pix'], 30)
+L_nhi_swir_pc = L_nhi_conteos.aggregate_array('nhi_swir_count')
+L_nhi_swnir_pc = L_nhi_conteos.aggregate_array('nhi_swnir_count')
+L_nhi_ep_pc = L_nhi_conteos.aggregate_array('L_ext_pix_count')
+L_nhi_swir_area = L_nhi_conteos.aggregate_array('nhi_swir_area')
+L_nhi_swnir_area = L_nhi_conteos.aggregate_array('nhi_swnir_area')
+L_nhi_ep_area = L_nhi_conteos.aggregate_array('L_ext_pix_area')
 
 
 #====================================================================#
 #                  ELIMINAR LAS IMÁGENES NHI VACÍAS                  #
 #====================================================================#
-filt_L_nhi_swir = filter_empty_images(
-    collection=L_nhi_ext_pix.select('nhi_swir'),
-    region=roi,
-    scale=30
-)
+# Una imagen está vacía si su conteo de pixeles (ya calculado) es 0, así que
+# basta con filtrar por las propiedades '<banda>_count' sin otra reducción
+filt_L_nhi_swir = L_nhi_conteos.filter(ee.Filter.gt('nhi_swir_count', 0)).select('nhi_swir')
 
-filt_L_nhi_swnir = filter_empty_images(
-    collection=L_nhi_ext_pix.select('nhi_swnir'),
-    region=roi,
-    scale=30
-)
+filt_L_nhi_swnir = L_nhi_conteos.filter(ee.Filter.gt('nhi_swnir_count', 0)).select('nhi_swnir')
 
-filt_L_nhi_ep = filter_empty_images(
-    collection=L_nhi_ext_pix.select('L_ext_pix'),
-    region=roi,
-    scale=30
-)
+filt_L_nhi_ep = L_nhi_conteos.filter(ee.Filter.gt('L_ext_pix_count', 0)).select('L_ext_pix')
 
 
 #===================================================================#
@@ -418,88 +348,174 @@ filt_L_nhi_ep = filter_empty_images(
 
 print('\nComputing the Landsat radiances for bands 6 & 7...')
 
-#=============================#
-# Para la banda 6 del Landsat #
-#=============================#
-Lb6_masked_swir = Lcal.map(mask_L_B6_swir)
-#print('Lb6_masked_swir:',Lb6_masked_swir.first().bandNames().getInfo())
+#=======================================================#
+# Bandas 6 y 7 del Landsat enmascaradas con ambos NHI   #
+#=======================================================#
+L_rad_sumas = sum_band_each_image(L_nhi_ext_pix, ['B6_nhi_masked_swir', 'B6_nhi_masked_swnir',
+                                                  'B7_nhi_masked_swir', 'B7_nhi_masked_swnir'], 30)
 
-Lb6_masked_swnir = Lcal.map(mask_L_B6_swnir)
-#print('Lb6_masked_swnir:',Lb6_masked_swnir.first().bandNames().getInfo())
-
-Lrad_b6_swir = sum_band_each_image(Lb6_masked_swir, 'B6_nhi_masked_swir', 30)
+Lrad_b6_swir = L_rad_sumas.aggregate_array('B6_nhi_masked_swir')
 #print('Radiancia banda 6 nhi_swir:', Lrad_b6_swir.getInfo())
 #
-Lrad_b6_swnir = sum_band_each_image(Lb6_masked_swnir, 'B6_nhi_masked_swnir', 30)
+Lrad_b6_swnir = L_rad_sumas.aggregate_array('B6_nhi_masked_swnir')
 #print('Radiancia banda 6 nhi_swnir:', Lrad_b6_swnir.getInfo())
-
-rad_tot_Lb6 = eelist2float(Lrad_b6_swir) + eelist2float(Lrad_b6_swnir)
-#print('Landsat B6 radiancia total =', rad_tot_Lb6, '\n')
-
-#=============================#
-# Para la banda 7 del Landsat #
-#=============================#
-Lb7_masked_swir = Lcal.map(mask_L_B7_swir)
-#print('Lb7_masked_swir:',Lb7_masked_swir.first().bandNames().getInfo())
-
-Lb7_masked_swnir = Lcal.map(mask_L_B7_swnir)
-#print('Lb6_masked_swnir:',Lb6_masked_swnir.first().bandNames().getInfo())
-
-Lrad_b7_swir = sum_band_each_image(Lb7_masked_swir, 'B7_nhi_masked_swir', 30)
+#
+Lrad_b7_swir = L_rad_sumas.aggregate_array('B7_nhi_masked_swir')
 #print('Radiancia banda 7 nhi_swir:', Lrad_b7_swir.getInfo())
 #
-Lrad_b7_swnir = sum_band_each_image(Lb7_masked_swnir, 'B7_nhi_masked_swnir', 30)
+Lrad_b7_swnir = L_rad_sumas.aggregate_array('B7_nhi_masked_swnir')
 #print('Radiancia banda 7 nhi_swnir:', Lrad_b7_swnir.getInfo())
 
-rad_tot_Lb7 = eelist2float(Lrad_b7_swir) + eelist2float(Lrad_b7_swnir)
-#print('Landsat B7 radiancia total =', rad_tot_Lb7)
+
+#===================================================================#
+#   OBTENER TODOS LOS RESULTADOS CON UNA SOLA LLAMADA A getInfo()   #
+#===================================================================#
+# Cada getInfo() es una petición (ida y vuelta) al servidor de GEE, por eso
+# se agrupan todos los resultados en un solo ee.Dictionary
+print('\nRetrieving the results from the GEE platform...')
+resultados = ee.Dictionary({
+    'size_L8': L8raw.size(),
+    'size_L9': L9raw.size(),
+    'size_Lcal': Lcal.size(),
+    'dates': Lcal.map(lambda img: img.set('date_str',
+        ee.Date(img.get('system:time_start')).format('YYYY-MMM-dd'))).aggregate_array('date_str'),
+    'epoch_ms': Lcal.aggregate_array('system:time_start'),
+    'swir_pc': L_nhi_swir_pc,
+    'swnir_pc': L_nhi_swnir_pc,
+    'ep_pc': L_nhi_ep_pc,
+    'swir_area': L_nhi_swir_area,
+    'swnir_area': L_nhi_swnir_area,
+    'ep_area': L_nhi_ep_area,
+    'rad_b6_swir': Lrad_b6_swir,
+    'rad_b6_swnir': Lrad_b6_swnir,
+    'rad_b7_swir': Lrad_b7_swir,
+    'rad_b7_swnir': Lrad_b7_swnir,
+    'size_swir': filt_L_nhi_swir.size(),
+    'size_swnir': filt_L_nhi_swnir.size(),
+    'size_ep': filt_L_nhi_ep.size(),
+    'ids_swir': filt_L_nhi_swir.aggregate_array('system:index'),
+    'ids_swnir': filt_L_nhi_swnir.aggregate_array('system:index'),
+    'ids_ep': filt_L_nhi_ep.aggregate_array('system:index')
+}).getInfo()
+
+# Número de imágenes de cada colección (se reutilizan más abajo)
+n_L8 = resultados['size_L8']
+n_L9 = resultados['size_L9']
+n_Lcal = resultados['size_Lcal']
+n_swir = resultados['size_swir']
+n_swnir = resultados['size_swnir']
+n_ep = resultados['size_ep']
+
+print(f"Number of Landsat-8 images that covers the site \
+{volcan} = {n_L8}")
+#
+print(f"Number of Landsat-9 images that covers the site \
+{volcan} = {n_L9}")
 #
+print(f"Total number of merged Landsat 8 & 9 callibrated and crop \
+= {n_Lcal}")
+
+# Extraer fechas de la colección Landsat unida. El texto 'YYYY-MMM-dd' para el
+# CSV ya viene formateado desde GEE; para el eje de tiempo de las gráficas los
+# milisegundos (epoch) se convierten directamente a datetime64 con NumPy
+fechas_str = pd.Series(resultados['dates'])
+fechas_dt = np.asarray(resultados['epoch_ms'], dtype='int64').astype('datetime64[ms]')
 
 #=============================================================================#
-def gee_raster_2_shp(collection, output_folder, scale=30):
-    import geopandas as gpd
-    from shapely.geometry import shape # Opcional, para manejo avanzado de geometrías
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+# Sesión HTTP compartida por todas las descargas: las conexiones TCP/TLS con
+# los servidores de GEE se reutilizan en lugar de abrir una nueva por imagen
+sesion_http = requests.Session()
+sesion_http.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4,
+                                                            pool_maxsize=24))
 
-    img_list = collection.toList(collection.size())
-    num_images = collection.size().getInfo()
+#=============================================================================#
+# Función para descargar en paralelo, en GeoTiff, la banda dada de las imágenes
+# img_ids. Los 'system:index' ya se conocen, así que cada imagen se busca en la
+# colección NHI sin filtrar (sin volver a evaluar el filtro por conteos) y se
+# descarga sin las consultas getInfo() que hace ee_export_image_collection
+def exportar_rasters(collection, banda, img_ids, out_dir, scale=30, workers=8):
+    def descargar(img_id):
+        image = ee.Image(collection.filter(ee.Filter.eq('system:index', img_id)).first()).select(banda)
+        filename = os.path.join(out_dir, f"{img_id}.tif")
+        # Se descarga a un archivo temporal y sólo al terminar se renombra, así
+        # una descarga interrumpida nunca deja un GeoTiff incompleto
+        filename_tmp = filename + ".part"
+        try:
+            url = image.getDownloadURL({
+                'name': img_id,
+                'scale': scale,
+                'region': image.geometry(),
+                'format': 'GEO_TIFF'
+            })
+            with sesion_http.get(url, stream=True, timeout=300) as r:
+                r.raise_for_status()
+                with open(filename_tmp, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+            os.replace(filename_tmp, filename)
+            print(f"Guardado: {filename}")
+        except Exception as e:
+            if os.path.exists(filename_tmp):
+                os.remove(filename_tmp)
+            print(f"Error en {img_id}: {e}")
 
-    for i in range(num_images):
-        image = ee.Image(img_list.get(i))
-        img_id = image.get('system:index').getInfo()
-        
-        image_int = image.select([0]).multiply(100).toInt32()
-        print(f"Vectorizando imagen: {img_id}...")
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(descargar, img_ids))
+
+#=============================================================================#
+def gee_raster_2_shp(collection, output_folder, scale=30, workers=8):
+    import geopandas as gpd # necesario para 'GEOPANDAS_GEODATAFRAME'
+    from shapely.geometry import shape # Opcional, para manejo avanzado de geometrías
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
 
+    # Vectorizar todas las imágenes en el servidor, etiquetando cada polígono
+    # con el 'system:index' de su imagen, y descargarlas juntas con
+    # computeFeatures (que pagina, sin el límite de 5000 elementos de getInfo)
+    def to_vec(image):
+        image_int = image.select([0]).multiply(100).toInt32()
+        vectors = image_int.reduceToVectors(
+            geometry=image.geometry(),
+            scale=scale,
+            geometryType='polygon',
+            eightConnected=True,
+            labelProperty='value',
+            maxPixels=1e10
+        )
+        return vectors.map(lambda feat: feat.set('img_id', image.get('system:index')))
+
+    print(f"Vectorizando imágenes en: {output_folder}...")
+    try:
+        gdf_all = ee.data.computeFeatures({
+            'expression': collection.map(to_vec).flatten(),
+            'fileFormat': 'GEOPANDAS_GEODATAFRAME'
+        })
+    except Exception as e:
+        print(f"Error en {output_folder}: {e}")
+        return
+
+    if gdf_all.empty:
+        print(f"Sin datos en {output_folder}")
+        return
+
+    gdf_all.crs = "EPSG:4326"
+
+    # Volver el valor a decimal en el archivo final
+    gdf_all['value'] = gdf_all['value'] / 100.0
+
+    # Escribir los vectores de cada imagen en paralelo, en formato GeoPackage
+    # (1 solo archivo por imagen en lugar de los 5 archivos del ESRI shapefile)
+    def guardar(grupo):
+        img_id, gdf = grupo
         try:
-            vectors = image_int.reduceToVectors(
-                geometry=image.geometry(),
-                scale=scale,
-                geometryType='polygon',
-                eightConnected=True,
-                labelProperty='value',
-                maxPixels=1e10
-            )
-
-            features = vectors.getInfo()['features']
-            
-            if features:
-                gdf = gpd.GeoDataFrame.from_features(features)
-                gdf.crs = "EPSG:4326"
-                
-                # Volver el valor a decimal en el archivo final
-                gdf['value'] = gdf['value'] / 100.0
-                
-                file_path = os.path.join(output_folder, f"{img_id}.shp")
-                gdf.to_file(file_path)
-                print(f"Guardado: {file_path}")
-            else:
-                print(f"Sin datos en {img_id}")
-                
+            file_path = os.path.join(output_folder, f"{img_id}.gpkg")
+            gdf.drop(columns='img_id').to_file(file_path, driver='GPKG')
+            print(f"Guardado: {file_path}")
         except Exception as e:
             print(f"Error en {img_id}: {e}")
 
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(guardar, gdf_all.groupby('img_id')))
+
 #=============================================================================#
 
 #================================================================#
@@ -536,48 +552,53 @@ nhi_html_folder = os.path.join(pwd, n4)#=================================#
 #=======================================================================================#
 #                          Guardar resultados Rasters y shapes                          #
 #=======================================================================================#
+# Lista de colecciones NHI (colección, banda, ids, carpeta) a descargar
+descargas = []
 # Colección NHI_SWIR #==========================================================#
-if (filt_L_nhi_swir.size().getInfo()) == 0:
+if n_swir == 0:
     print("\nNo NHI SWIR pixels were found")
 
 else:
-    if (Path(nhi_swir_folder).is_dir()) == False:
-        print('The following folder will be crated:"nhi_swir_results"\n')
-        os.mkdir(nhi_swir_folder)
-    geemap.ee_export_image_collection(filt_L_nhi_swir, out_dir=nhi_swir_folder)
-    gee_raster_2_shp(filt_L_nhi_swir.select('nhi_swir'), nhi_swir_folder)
+    Path(nhi_swir_folder).mkdir(parents=True, exist_ok=True)
+    descargas.append((filt_L_nhi_swir, 'nhi_swir', resultados['ids_swir'], nhi_swir_folder))
 #=============================#
 
 #=====================#
 # Colección NHI_SWNIR #=========================================================#
-if (filt_L_nhi_swnir.size().getInfo()) == 0:
+if n_swnir == 0:
     print("\nNo NHI SWNIR pixels were found \n")
 
 else:
-    if (Path(nhi_swnir_folder).is_dir()) == False:
-        print('The following folder will be crated:"nhi_swnir_results"\n')
-        os.mkdir(nhi_swnir_folder)
-    geemap.ee_export_image_collection(filt_L_nhi_swnir, out_dir=nhi_swnir_folder)
-    gee_raster_2_shp(filt_L_nhi_swnir.select('nhi_swnir'), nhi_swnir_folder)
+    Path(nhi_swnir_folder).mkdir(parents=True, exist_ok=True)
+    descargas.append((filt_L_nhi_swnir, 'nhi_swnir', resultados['ids_swnir'], nhi_swnir_folder))
 #=============================#
 
 #=====================#
 # Colección NHI_EP #=========================================================#
-if (filt_L_nhi_ep.size().getInfo()) == 0:
+if n_ep == 0:
     print("\nNo NHI Extreme Pixels were found \n")
 
 else:
-    if (Path(nhi_extremes_folder).is_dir()) == False:
-        print('The following folder will be crated:"nhi_extremes_results"\n')
-        os.mkdir(nhi_extremes_folder)
-    geemap.ee_export_image_collection(filt_L_nhi_ep, out_dir=nhi_extremes_folder)
-    gee_raster_2_shp(filt_L_nhi_ep.select('L_ext_pix'), nhi_extremes_folder)
+    Path(nhi_extremes_folder).mkdir(parents=True, exist_ok=True)
+    descargas.append((filt_L_nhi_ep, 'L_ext_pix', resultados['ids_ep'], nhi_extremes_folder))
 #=============================#
 
+#==========================================================#
+# Función para descargar los rásters y shapes de 1 colección NHI
+def exportar_nhi(descarga):
+    coleccion, banda, img_ids, carpeta = descarga
+    exportar_rasters(L_nhi_ext_pix, banda, img_ids, carpeta)
+    gee_raster_2_shp(coleccion.select(banda), carpeta)
+#==========================================================#
+
+# Las colecciones NHI se descargan en paralelo
+with ThreadPoolExecutor(max_workers=3) as ex:
+    list(ex.map(exportar_nhi, descargas))
 
-print('\nNumber of images containing NHI low to moderate hot pixels =', filt_L_nhi_swir.size().getInfo())
-print("Number of images containing NHI strong hot pixels:", filt_L_nhi_swnir.size().getInfo())
-print("Number of images containing NHI extreme hot pixels:", filt_L_nhi_ep.size().getInfo())
+
+print('\nNumber of images containing NHI low to moderate hot pixels =', n_swir)
+print("Number of images containing NHI strong hot pixels:", n_swnir)
+print("Number of images containing NHI extreme hot pixels:", n_ep)
 print("")
 
 #=============================================================================================#
@@ -587,51 +608,73 @@ print("")
 #===============================================================================#
 
 print('Generating the CSV data file...')
-#=====================================================#
-# Función para convertit una ee.lista and numpy entero
-def list2int(lista):
-  return np.array(lista, dtype='int')
-#=====================================================#
-
 #======================================#
-# nhi pix calientes
-nhi_tot_swir_pc = list2int(L_nhi_swir_pc)
-
-nhi_tot_swnir_pc = list2int(L_nhi_swnir_pc)
+# Conteos de pixeles por imagen en 1 solo arreglo (N, 3):
+# columnas -> nhi pix calientes SWIR, SWNIR y nhi pix calientes extremos
+conteos = np.asarray([resultados['swir_pc'], resultados['swnir_pc'],
+                      resultados['ep_pc']], dtype=np.int64).T
 
-#nhi_tot_hpc = list2int(L_nhi_swir_pc) + list2int(L_nhi_swnir_pc)
-nhi_tot_hpc = nhi_tot_swir_pc + nhi_tot_swnir_pc
+# nhi pix calientes
+nhi_tot_hpc = conteos[:, 0] + conteos[:, 1]
 #print('Landsat Cantidad Total de pixeles calientes por imagen:',nhi_tot_hpc)
 
+# Áreas (m2) por imagen en 1 solo arreglo (N, 3), calculadas en GEE:
+# columnas -> area nhi pix calientes SWIR, SWNIR y area nhi pix extremos
+areas = np.asarray([resultados['swir_area'], resultados['swnir_area'],
+                    resultados['ep_area']], dtype='float64').T
+
 # area nhi pix calientes
-nhi_tot_area = nhi_tot_hpc*900
+nhi_tot_area = areas[:, 0] + areas[:, 1]
 #print('Landsat Área Total de pixeles calientes por imagen:',nhi_tot_area)
 
-# nhi pix calientes extremos
-L_nhi_ep_pc = list2int(L_nhi_ep_pc)
-#print('Landsat Cantidad Total de pixeles calientes EXTREMOS:',L_nhi_ep_pc)
-
 # area nhi pix calientes extremos
-L_nhi_ep_pc_area = L_nhi_ep_pc*900
+L_nhi_ep_pc_area = areas[:, 2]
 #print('Landsat área Total de píxeles calientes EXTREMOS:',L_nhi_ep_pc_area)
 
-columnas = ["Date", "Total NHI SWIR hot pixels", "Total NHI SWNIR hot pixels", \
-           "Total NHI SWIR + SWNIR hot pixels", "Hot pixels area m2",\
-           "Total NHI extreme pixels", "Extreme hot pixels area m2",\
-           "Radiance B6 (1.6 μm)", "Radiance B7 (2.2 μm)"]
-#
-df = pd.DataFrame(zip(fechas_dt, nhi_tot_swir_pc, nhi_tot_swnir_pc, nhi_tot_hpc, nhi_tot_area,\
-     L_nhi_ep_pc, L_nhi_ep_pc_area,rad_tot_Lb6,rad_tot_Lb7),columns=columnas)
+# Radiancias por imagen en 1 solo arreglo (N, 4):
+# columnas -> B6 swir, B6 swnir, B7 swir, B7 swnir
+radiancias = np.asarray([resultados['rad_b6_swir'], resultados['rad_b6_swnir'],
+                         resultados['rad_b7_swir'], resultados['rad_b7_swnir']],
+                        dtype='float32').T
+
+# Radiancias totales B6 y B7
+rad_tot_Lb6 = radiancias[:, 0] + radiancias[:, 1]
+#print('Landsat B6 radiancia total =', rad_tot_Lb6, '\n')
+rad_tot_Lb7 = radiancias[:, 2] + radiancias[:, 3]
+#print('Landsat B7 radiancia total =', rad_tot_Lb7)
+
+df = pd.DataFrame({
+    "Date": fechas_dt,
+    "Total NHI SWIR hot pixels": conteos[:, 0],
+    "Total NHI SWNIR hot pixels": conteos[:, 1],
+    "Total NHI SWIR + SWNIR hot pixels": nhi_tot_hpc,
+    "Hot pixels area m2": nhi_tot_area,
+    "Total NHI extreme pixels": conteos[:, 2],
+    "Extreme hot pixels area m2": L_nhi_ep_pc_area,
+    "Radiance B6 (1.6 μm)": rad_tot_Lb6,
+    "Radiance B7 (2.2 μm)": rad_tot_Lb7
+})
 #
 df = df.sort_values(by='Date', ascending=True)
-df['Date'] = df['Date'].dt.strftime('%Y-%b-%d')
-#print("df['Date']\n", df['Date'])
+# La columna 'Date' se mantiene como datetime para las gráficas (plotly maneja
+# las fechas de forma nativa); al CSV van las fechas en texto calculadas en GEE
+# (se alinean por el índice, así que conservan el orden de df)
+df_csv = df.assign(Date=fechas_str)
+#print("df_csv['Date']\n", df_csv['Date'])
 nombre_csv_ext = "NHI_all_results_"+volcan+".csv"
 csv_name = os.path.join(pwd, nombre_csv_ext)
-df.to_csv(nombre_csv_ext, index=False)
+df_csv.to_csv(nombre_csv_ext, index=False)
 print("Snippet of the CSV's file content:")
-print(df.head())
+print(df_csv.head())
 print(f"\nNHI and radiance results saved into file: {nombre_csv_ext}\n")
+# Copia de los resultados en formato Parquet, más rápido de escribir y leer
+# para series largas (años de imágenes), sólo si pyarrow está instalado
+nombre_parquet = nombre_csv_ext.replace(".csv", ".parquet")
+if importlib.util.find_spec("pyarrow") is not None: # conda install -c conda-forge pyarrow
+    df.to_parquet(nombre_parquet, index=False, engine="pyarrow")
+    print(f"NHI and radiance results also saved into file: {nombre_parquet}\n")
+else:
+    print(f"pyarrow is not installed, the file {nombre_parquet} was skipped\n")
 
 #=====================================================================================#
 #                                      GRÁFICAS                                       #